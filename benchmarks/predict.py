@@ -0,0 +1,38 @@
+import numpy as np
+import tracemalloc
+from pyearth import Earth
+from timeit import Timer
+
+# Compare Earth.predict, which transforms the data in blocks of rows, with
+# materializing the full basis matrix and multiplying it by the coefficients.
+
+np.random.seed(0)
+nb_train = 2000
+nb_predict = 200000
+nb_features = 10
+X = np.random.uniform(-1, 1, size=(nb_train, nb_features))
+y = np.abs(X[:, 0]) * X[:, 1] + np.sin(3 * X[:, 2]) + \
+    np.random.normal(0, .1, size=nb_train)
+X_predict = np.asfortranarray(
+    np.random.uniform(-1, 1, size=(nb_predict, nb_features)))
+
+model = Earth(max_degree=2, max_terms=60, penalty=0).fit(X, y)
+print("Terms: {0}".format(model.basis_.plen()))
+
+
+def full():
+    return np.dot(model.transform(X_predict), model.coef_.T)
+
+
+def blocked():
+    return model.predict(X_predict)
+
+
+for name, func in (("Full", full), ("Blocked", blocked)):
+    tracemalloc.start()
+    func()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    duration = Timer(func).timeit(number=5) / 5
+    print("{0}: peak memory={1:.1f}MB, duration={2:.3f}s".
+          format(name, peak / 1e6, duration))
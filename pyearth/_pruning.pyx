@@ -5,7 +5,7 @@
 # cython: profile = False
 
 from ._record cimport PruningPassIteration
-from ._util cimport gcv, apply_weights_2d
+from ._util cimport gcv
 import numpy as np
 
 from collections import defaultdict
@@ -13,6 +13,25 @@ from collections import defaultdict
 GCV, RSS, NB_SUBSETS = "gcv", "rss", "nb_subsets"
 FEAT_IMP_CRITERIA = (GCV, RSS, NB_SUBSETS)
 
+cdef FLOAT_t rss(list systems, list cols) except? -1:
+    '''Residual sum of squares of projecting each R_y onto the numerical
+    column space of R_B[:, cols], for each (R_B, R_y) in systems.'''
+    cdef FLOAT_t result = 0.
+    for R_B, R_y in systems:
+        # Forward pass bases routinely contain exactly collinear columns (for
+        # example a pair of hinges times their shared parent), so singular
+        # values at the rounding error level are treated as zero, using the
+        # same threshold as lstsq.  The columns are scaled to unit norm first
+        # so that this does not depend on their scale (for example, a linear
+        # term in a variable with a large offset).
+        R_S = R_B[:, cols]
+        norms = np.sqrt(np.sum(R_S ** 2, axis=0))
+        norms[norms == 0.] = 1.
+        U, s, _ = np.linalg.svd(R_S / norms, full_matrices=False)
+        U = U[:, s > np.finfo(np.float64).eps * max(R_S.shape) * s[0]]
+        result += np.sum((R_y - np.dot(U, np.dot(U.T, R_y))) ** 2)
+    return result
+
 cdef class PruningPasser:
     '''Implements the generic pruning pass as described by Friedman, 1991.'''
     def __init__(PruningPasser self, Basis basis,
@@ -29,7 +48,6 @@ cdef class PruningPasser:
         self.sample_weight = sample_weight
         self.verbose = verbose
         self.basis = basis
-        self.B = np.empty(shape=(self.m, len(self.basis) + 1), dtype=np.float)
         self.penalty = kwargs.get('penalty', 3.0)
         if sample_weight.shape[1] == 1:
             y_avg = np.average(self.y, weights=sample_weight[:,0], axis=0)
@@ -45,10 +63,14 @@ cdef class PruningPasser:
             self.feature_importance[criterion] = np.zeros((self.n,))
 
     cpdef run(PruningPasser self):
-        # This is a totally naive implementation and could potentially be made
-        # faster through the use of updating algorithms.  It is not clear that
-        # such optimization would be worthwhile, as the pruning pass is not the
-        # slowest part of the algorithm.
+        # Each candidate subset is scored by a least squares fit.  Rather than
+        # refitting against the full m x p weighted basis matrix every time,
+        # the problem is compressed once per weight column: if
+        # Q R = [sqrt(w) B, sqrt(w) y], then for any subset of the columns of
+        # B the residual sum of squares is that of the same columns of
+        # R_B = R[:, :p] against R_y = R[:, p:].  R has at most p + k rows
+        # (k outputs), so each candidate costs O((p + k) p^2) instead of
+        # O(m p^2), and the basis is transformed only once.
         cdef INDEX_t i
         cdef INDEX_t j
         cdef long v
@@ -62,8 +84,6 @@ cdef class PruningPasser:
         cdef FLOAT_t best_iteration_mse
         cdef FLOAT_t mse, mse0, total_weight
 
-        cdef cnp.ndarray[FLOAT_t, ndim = 2] B = (
-            <cnp.ndarray[FLOAT_t, ndim = 2] > self.B)
         cdef cnp.ndarray[FLOAT_t, ndim = 2] X = (
             <cnp.ndarray[FLOAT_t, ndim = 2] > self.X)
         cdef cnp.ndarray[BOOL_t, ndim = 2] missing = (
@@ -72,37 +92,47 @@ cdef class PruningPasser:
             <cnp.ndarray[FLOAT_t, ndim = 2] > self.y)
         cdef cnp.ndarray[FLOAT_t, ndim = 2] sample_weight = (
             <cnp.ndarray[FLOAT_t, ndim = 2] > self.sample_weight)
-        cdef cnp.ndarray[FLOAT_t, ndim = 1] weighted_y
+        cdef cnp.ndarray[FLOAT_t, ndim = 2] A
+        cdef list systems = []
+        cdef list active
+        cdef dict col_of
 
         if self.verbose >= 1:
             print('Beginning pruning pass')
 
+        # Map each unpruned basis function to its column in the transformed
+        # basis matrix
+        active = [j for j in range(basis_size)
+                  if not self.basis[j].is_pruned()]
+        col_of = dict(zip(active, range(pruned_basis_size)))
+
+        # Compress the weighted least squares problem once for each distinct
+        # column of sample_weight
+        if sample_weight.shape[1] == 1:
+            groups = [(sample_weight[:, 0], y)]
+        else:
+            groups = [(sample_weight[:, p], y[:, p:p + 1])
+                      for p in range(y.shape[1])]
+        for weights, y_ in groups:
+            A = np.empty(shape=(self.m, pruned_basis_size + y_.shape[1]),
+                         order='F')
+            self.basis.weighted_transform(X, missing, A[:, :pruned_basis_size],
+                                          weights)
+            A[:, pruned_basis_size:] = y_ * np.sqrt(weights)[:, np.newaxis]
+            R = np.linalg.qr(A, mode='r')
+            systems.append((R[:, :pruned_basis_size], R[:, pruned_basis_size:]))
+
         # Initial solution
-        mse = 0.
         mse0 = 0.
         total_weight = 0.
         for p in range(y.shape[1]):
             if sample_weight.shape[1] == 1:
-                weighted_y = y[:,p] * np.sqrt(sample_weight[:,0])
-                self.basis.weighted_transform(X, missing, B, sample_weight[:, 0])
                 total_weight += np.sum(sample_weight[:,0])
                 mse0 += np.sum(sample_weight[:,0] * (y[:,p] - np.average(y[:,p], weights=sample_weight[:,0])) ** 2)
             else:
-                weighted_y = y[:,p] * np.sqrt(sample_weight[:,p])
-                self.basis.weighted_transform(X, missing, B, sample_weight[:, p])
                 total_weight += np.sum(sample_weight[:,p])
                 mse0 += np.sum(sample_weight[:,p] * (y[:,p] - np.average(y[:,p], weights=sample_weight[:,p])) ** 2)
-            if sample_weight.shape[1] == 1:
-                self.basis.weighted_transform(X, missing, B, sample_weight[:, 0])
-            else:
-                self.basis.weighted_transform(X, missing, B, sample_weight[:, p])
-            beta, mse_ = np.linalg.lstsq(B[:, 0:(basis_size)], weighted_y)[0:2]
-            if mse_:
-                pass
-            else:
-                mse_ = np.sum(
-                    (np.dot(B[:, 0:basis_size], beta) - weighted_y) ** 2)
-            mse += mse_
+        mse = rss(systems, list(range(pruned_basis_size)))
         
         # Create the record object
         self.record = PruningPassRecord(
@@ -131,25 +161,9 @@ cdef class PruningPasser:
                 if not bf.is_prunable():
                     continue
                 bf.prune()
-                
-
-                mse = 0.
-                for p in range(y.shape[1]):
-                    if sample_weight.shape[1] == 1:
-                        weighted_y = y[:,p] * np.sqrt(sample_weight[:,0])
-                        self.basis.weighted_transform(X, missing, B, sample_weight[:, 0])
-                    else:
-                        weighted_y = y[:,p] * np.sqrt(sample_weight[:,p])
-                        self.basis.weighted_transform(X, missing, B, sample_weight[:, p])
-                    beta, mse_ = np.linalg.lstsq(
-                        B[:, 0:pruned_basis_size], weighted_y)[0:2]
-                    if mse_:
-                        pass
-#                         mse_ /= np.sum(self.sample_weight)
-                    else:
-                        mse_ = np.sum((np.dot(B[:, 0:pruned_basis_size], beta) -
-                                    weighted_y) ** 2) #/ np.sum(sample_weight)
-                    mse += mse_# * output_weight[p]
+
+                mse = rss(systems, [col_of[k] for k in active
+                                    if not self.basis[k].is_pruned()])
                 gcv_ = gcv(mse / np.sum(sample_weight), pruned_basis_size, self.m, self.penalty)
 
                 if gcv_ <= best_iteration_gcv or first:
@@ -1,15 +1,24 @@
 from ._forward import ForwardPasser
 from ._pruning import PruningPasser, FEAT_IMP_CRITERIA
-from ._util import ascii_table, apply_weights_2d, gcv
+from ._util import ascii_table, gcv
 from ._types import BOOL
 from sklearn.base import RegressorMixin, BaseEstimator, TransformerMixin
 from sklearn.utils.validation import (assert_all_finite, check_is_fitted,
                                       check_X_y)
 import numpy as np
 from scipy import sparse
+from scipy.linalg import cho_factor, cho_solve, lstsq, LinAlgError
 from ._version import get_versions
 __version__ = get_versions()['version']
 
+# Number of rows transformed at a time when predicting
+PREDICT_BLOCK_SIZE = 4096
+
+# linear_fit only solves the normal equations if no column of the basis
+# is within a relative distance of CHOLESKY_RTOL of the span of the previous
+# columns, since forming the normal equations squares the condition number
+CHOLESKY_RTOL = 1e3 * np.sqrt(np.finfo(np.float64).eps)
+
 class Earth(BaseEstimator, RegressorMixin, TransformerMixin):
 
     """
@@ -33,9 +42,15 @@ class Earth(BaseEstimator, RegressorMixin, TransformerMixin):
     The final result is a set of terms that is nonlinear in the original
     feature space, may include interactions, and is likely to generalize well.
 
-    The Earth class supports dense input only.  Data structures from the
-    pandas and patsy modules are supported, but are copied into numpy arrays
-    for computation.  No copy is made if the inputs are numpy float64 arrays.
+    The Earth class must be fit on dense input.  The predict and transform
+    methods also accept scipy sparse matrices, which are converted to dense
+    arrays a block of rows at a time.  Data structures from the pandas and
+    patsy modules are supported, but are copied into numpy arrays for
+    computation.  No copy of X is made if it is a Fortran ordered (column
+    major) numpy float64 array, and no copy of y or sample_weight is made if
+    it is a numpy float64 array (sample_weight is still copied if
+    output_weight is given).  The fit method converts its inputs only once
+    and reuses them for the forward pass, pruning pass, and linear fit.
     Earth objects can be serialized using the pickle module and copied
     using the copy module.
 
@@ -278,7 +293,7 @@ class Earth(BaseEstimator, RegressorMixin, TransformerMixin):
 
     """
 
-    forward_pass_arg_names = set([
+    forward_pass_arg_names = frozenset([
         'max_terms', 'max_degree', 'allow_missing', 'penalty',
         'endspan_alpha', 'endspan',
         'minspan_alpha', 'minspan',
@@ -288,7 +303,7 @@ class Earth(BaseEstimator, RegressorMixin, TransformerMixin):
         'feature_importance_type',
         'verbose'
     ])
-    pruning_pass_arg_names = set([
+    pruning_pass_arg_names = frozenset([
         'penalty',
         'feature_importance_type',
         'verbose'
@@ -325,20 +340,36 @@ class Earth(BaseEstimator, RegressorMixin, TransformerMixin):
         self.verbose = verbose
         self._version = __version__
 
+    @classmethod
+    def _get_param_names(cls):
+        '''
+        Cached version of BaseEstimator._get_param_names, which introspects
+        the signature of __init__ on every call.  It is called by get_params
+        and therefore by clone, once per fold during cross validation.
+        '''
+        names = cls.__dict__.get('_param_names')
+        if names is None:
+            names = tuple(super(Earth, cls)._get_param_names())
+            cls._param_names = names
+        return list(names)
+
     def __eq__(self, other):
         if self.__class__ is not other.__class__:
             return False
-        keys = set(self.__dict__.keys()) | set(other.__dict__.keys())
-        for k in keys:
-            try:
-                v_self = self.__dict__[k]
-                v_other = other.__dict__[k]
-            except KeyError:
-                return False
+        if set(self.__dict__.keys()) != set(other.__dict__.keys()):
+            return False
+        for k, v_self in self.__dict__.items():
+            v_other = other.__dict__[k]
+            if (isinstance(v_self, np.ndarray) or
+                    isinstance(v_other, np.ndarray)):
+                # Checks shapes before comparing any elements
+                if not np.array_equal(v_self, v_other):
+                    return False
+                continue
             try:
                 if v_self != v_other:
                     return False
-            except ValueError:  # Case of numpy arrays
+            except ValueError:  # Case of containers of numpy arrays
                 if np.any(v_self != v_other):
                     return False
         return True
@@ -350,64 +381,62 @@ class Earth(BaseEstimator, RegressorMixin, TransformerMixin):
         '''
         Pull named arguments relevant to the forward pass.
         '''
-        result = {}
-        for name in self.forward_pass_arg_names:
-            if name in kwargs and kwargs[name] is not None:
-                result[name] = kwargs[name]
-        return result
+        return {name: kwargs[name] for name in
+                self.forward_pass_arg_names.intersection(kwargs)
+                if kwargs[name] is not None}
 
     def _pull_pruning_args(self, **kwargs):
         '''
         Pull named arguments relevant to the pruning pass.
         '''
-        result = {}
-        for name in self.pruning_pass_arg_names:
-            if name in kwargs and kwargs[name] is not None:
-                result[name] = kwargs[name]
-        return result
+        return {name: kwargs[name] for name in
+                self.pruning_pass_arg_names.intersection(kwargs)
+                if kwargs[name] is not None}
 
     def _scrape_labels(self, X):
         '''
         Try to get labels from input data (for example, if X is a
         pandas DataFrame).  Return None if no labels can be extracted.
         '''
-        try:
-            labels = list(X.columns)
-        except AttributeError:
-            try:
-                labels = list(X.design_info.column_names)
-            except AttributeError:
-                try:
-                    labels = list(X.dtype.names)
-                except TypeError:
-                    try:
-                        labels = ['x%d' % i for i in range(X.shape[1])]
-                    except IndexError:
-                        labels = ['x%d' % i for i in range(1)]
-                # handle case where X is not np.array (e.g list)
-                except AttributeError:
-                    X = np.array(X)
-                    labels = ['x%d' % i for i in range(X.shape[1])]
-        return labels
-
-    def _scrub_x(self, X, missing, **kwargs):
+        # Look the attributes up with getattr rather than catching
+        # exceptions, since plain numpy arrays are the common case.
+        labels = getattr(X, 'columns', None)
+        if labels is None:
+            design_info = getattr(X, 'design_info', None)
+            if design_info is not None:
+                labels = design_info.column_names
+        if labels is None:
+            # handle case where X is not np.array (e.g list)
+            if not hasattr(X, 'dtype'):
+                X = np.asarray(X)
+            labels = X.dtype.names
+        if labels is None:
+            if len(X.shape) > 1:
+                labels = ['x%d' % i for i in range(X.shape[1])]
+            else:
+                labels = ['x0']
+        return list(labels)
+
+    def _scrub_x(self, X, missing, accept_sparse=False, **kwargs):
         '''
         Sanitize input predictors and extract column names if appropriate.
+        If accept_sparse is True, sparse X is returned in CSR format and
+        is scrubbed one block at a time later on by _get_block.
         '''
         # Check for sparseness
         if sparse.issparse(X):
-            raise TypeError('A sparse matrix was passed, but dense data '
-                            'is required. Use X.toarray() to convert to '
-                            'dense.')
+            if not accept_sparse:
+                raise TypeError('A sparse matrix was passed, but dense data '
+                                'is required. Use X.toarray() to convert to '
+                                'dense.')
+            X = sparse.csr_matrix(X, dtype=np.float64)
+            if hasattr(self, 'basis_') and self.basis_ is not None:
+                if X.shape[1] != self.basis_.num_variables:
+                    raise ValueError(
+                        'Wrong number of columns in X. Reshape your data.')
+            return X, missing
         X = np.asarray(X, dtype=np.float64, order='F')
         
-        # Figure out missingness
-        missing_is_nan = False
-        if missing is None:
-            # Infer missingness
-            missing = np.isnan(X)
-            missing_is_nan = True
-            
         if not self.allow_missing:
             try:
                 assert_all_finite(X)
@@ -415,6 +444,18 @@ class Earth(BaseEstimator, RegressorMixin, TransformerMixin):
                 raise ValueError(
                     "Input contains NaN, infinity or a value that's too large."
                     "Did you mean to set allow_missing=True?")
+
+        # Figure out missingness
+        missing_is_nan = False
+        if missing is None:
+            if self.allow_missing:
+                # Infer missingness
+                missing = np.isnan(X)
+                missing_is_nan = True
+            else:
+                # X is known to be finite, so nothing is missing and there
+                # is no need to scan it again
+                missing = np.zeros(X.shape, dtype=BOOL, order='F')
         if X.ndim == 1:
             X = X[:, np.newaxis]
 
@@ -431,9 +472,11 @@ class Earth(BaseEstimator, RegressorMixin, TransformerMixin):
                 X = X.copy()
                 X[missing] = 0.
         
-        # Convert to internally used data type
+        # Convert to internally used data type.  Boolean arrays have the
+        # same item size as BOOL, so they can be viewed rather than copied.
+        if isinstance(missing, np.ndarray) and missing.dtype == np.bool_:
+            missing = missing.view(BOOL)
         missing = np.asarray(missing, dtype=BOOL, order='F')
-        assert_all_finite(missing)
         if missing.ndim == 1:
             missing = missing[:, np.newaxis]
         
@@ -464,7 +507,8 @@ class Earth(BaseEstimator, RegressorMixin, TransformerMixin):
         # Handle X separately
         X, missing = self._scrub_x(X, missing, **kwargs)
 
-        # Convert y to internally used data type
+        # Convert y to internally used data type.  This is a no-op for
+        # float64 arrays, and y[:, np.newaxis] below is a view.
         y = np.asarray(y, dtype=np.float64)
         assert_all_finite(y)
 
@@ -493,20 +537,14 @@ class Earth(BaseEstimator, RegressorMixin, TransformerMixin):
         if output_weight is not None and y.shape[1] != output_weight.shape[0]:
             raise ValueError(
                 'y and output_weight do not have compatible dimensions.')
-        if y.shape[1] > 1:
-            if sample_weight.shape[1] == 1 and output_weight is not None:
-                sample_weight = np.repeat(sample_weight, y.shape[1], axis=1)
         if output_weight is not None:
-            sample_weight *= output_weight
-
-        # Make sure everything is finite (except X, which is allowed to have
-        # missing values)
-        assert_all_finite(missing)
-        assert_all_finite(y)
-        assert_all_finite(sample_weight)
-        assert_all_finite(output_weight)
+            # Not in place, since sample_weight may be the caller's array.
+            # Broadcasting expands a single column of sample_weight to one
+            # column per output.
+            sample_weight = sample_weight * output_weight
 
-        # Make sure everything is consistent
+        # Make sure everything is consistent.  Finiteness of y,
+        # sample_weight and output_weight has already been checked above.
         check_X_y(X, y, accept_sparse=False, multi_output=True,
                   force_all_finite=False)
 
@@ -912,15 +950,14 @@ class Earth(BaseEstimator, RegressorMixin, TransformerMixin):
                        i for i in range(self.coef_.shape[0])]
         else:
             header += ['Coefficient']
-        data = []
-
-        i = 0
-        for bf in self.basis_:
-            data.append([str(bf), 'Yes' if bf.is_pruned() else 'No'] + [
-                          '%g' % self.coef_[c, i] if not bf.is_pruned() else
-                          'None' for c in range(self.coef_.shape[0])])
-            if not bf.is_pruned():
-                i += 1
+
+        # Format all coefficients at once.  The rows of coef_strs line up
+        # with the unpruned basis functions, in order.
+        coef_strs = iter(np.char.mod('%g', self.coef_.T).tolist())
+        none_strs = ['None'] * self.coef_.shape[0]
+        data = [[str(bf), 'Yes'] + none_strs if bf.is_pruned() else
+                [str(bf), 'No'] + next(coef_strs)
+                for bf in self.basis_]
         result += ascii_table(header, data)
         result += '\n'
         result += 'MSE: %.4f, GCV: %.4f, RSQ: %.4f, GRSQ: %.4f' % (
@@ -1024,39 +1061,86 @@ class Earth(BaseEstimator, RegressorMixin, TransformerMixin):
 #         if sample_weight.shape[1]:
 #             sample_weight = np.repeat(sample_weight,y.shape[1],axis=1)
 
+        # Transform into basis space.  B is Fortran ordered, as LAPACK
+        # expects, and is computed only once for all outputs.  If all
+        # outputs share the same weights, the weighted B and its Cholesky
+        # factor are shared too.
+        B = np.empty(shape=(X.shape[0], self.basis_.plen()), order='F')
+        self.basis_.transform(X, missing, B)
+        shared_weight = sample_weight.shape[1] == 1
+        if not shared_weight:
+            unweighted_B = B
+            B = np.empty_like(unweighted_B)
+
         # Solve the linear least squares problem
         self.coef_ = []
         resid_ = []
         total_weight = 0.
         mse0 = 0.
+        factor = None
         for i in range(y.shape[1]):
 
             # Figure out the weight column
-            if sample_weight.shape[1] > 1:
-                w = sample_weight[:, i]
-            else:
+            if shared_weight:
                 w = sample_weight[:, 0]
+            else:
+                w = sample_weight[:, i]
 
-            # Transform into basis space
-            B = self.transform(X, missing)  # * w[:, None]
-            apply_weights_2d(B, w)
+            # Apply the square root of the weights to both B and y (the sqrt
+            # is computed only once)
+            sqrt_w = np.sqrt(w)
+            if not shared_weight:
+                np.multiply(unweighted_B, sqrt_w[:, np.newaxis], out=B)
+                factor = None
+            elif i == 0:
+                np.multiply(B, sqrt_w[:, np.newaxis], out=B)
+            weighted_y = y[:, i] * sqrt_w
 
             # Compute total weight
             total_weight += np.sum(w)
 
-            # Apply weights to y
-            weighted_y = y.copy()
-            weighted_y *= np.sqrt(w[:, np.newaxis])
-
             # Compute the mse0
-            mse0 += np.sum((weighted_y[:, i] -
-                            np.average(weighted_y[:, i])) ** 2)
-
-            coef, resid = np.linalg.lstsq(B, weighted_y[:, i])[0:2]
+            mse0 += np.sum((weighted_y - np.average(weighted_y)) ** 2)
+
+            # Solve the normal equations by Cholesky factorization.  The
+            # basis is usually tall and skinny, so this is much cheaper than
+            # the SVD used by lstsq.  Forming B.T B squares the condition
+            # number, so fall back to a pivoted QR (factor is then False)
+            # unless B is well conditioned.  Numerically singular bases are
+            # common and rarely make cho_factor fail outright, so also check
+            # each diagonal entry of the factor, which is the norm of the
+            # part of a column of B orthogonal to the previous columns,
+            # against the norm of the whole column.
+            # The inputs have already been checked for finiteness.  B and
+            # weighted_y are needed below for the residual, so only the
+            # temporaries of the normal equations are overwritten.
+            if factor is None:
+                gram = np.dot(B.T, B)
+                norms = np.sqrt(np.diag(gram))
+                norms[norms == 0.] = 1.
+                try:
+                    factor = cho_factor(gram, lower=True, overwrite_a=True,
+                                        check_finite=False)
+                except LinAlgError:
+                    factor = False
+                else:
+                    if np.any(np.abs(np.diag(factor[0])) <=
+                              CHOLESKY_RTOL * norms):
+                        factor = False
+            if factor is not False:
+                coef = cho_solve(factor, np.dot(B.T, weighted_y),
+                                 overwrite_b=True, check_finite=False)
+            else:
+                # Scale the columns of B to unit norm so that the rank
+                # decision does not depend on their scale, and use the same
+                # threshold as np.linalg.lstsq
+                coef = lstsq(B / norms, weighted_y,
+                             cond=np.finfo(np.float64).eps * max(B.shape),
+                             lapack_driver='gelsy',
+                             check_finite=False)[0] / norms
             self.coef_.append(coef)
-            if not resid:
-                resid = np.array(
-                    [np.sum((np.dot(B, coef) - weighted_y[:, i]) ** 2)])
+            resid = np.array(
+                [np.sum((np.dot(B, coef) - weighted_y) ** 2)])
             resid_.append(resid)
         resid_ = np.array(resid_)
         self.coef_ = np.array(self.coef_)
@@ -1110,7 +1194,8 @@ class Earth(BaseEstimator, RegressorMixin, TransformerMixin):
         X : array-like, shape = [m, n] where m is the number of samples and n
             is the number of features
             The training predictors.  The X parameter can be a numpy
-            array, a pandas DataFrame, or a patsy DesignMatrix.
+            array, a scipy sparse matrix, a pandas DataFrame, or a patsy
+            DesignMatrix.
 
         missing : array-like, shape = [m, n] where m is the number of samples
             and n is the number of features.
@@ -1127,10 +1212,12 @@ class Earth(BaseEstimator, RegressorMixin, TransformerMixin):
                 and p is the number of outputs
                 The predicted values.
         '''
-        if not skip_scrub:
-            X, missing = self._scrub_x(X, missing)
-        B = self.transform(X, missing)
-        y = np.dot(B, self.coef_.T)
+        check_is_fitted(self, "basis_")
+        # Blocked prediction needs a missing mask, so scrub anyway if none
+        # was given
+        if not skip_scrub or missing is None:
+            X, missing = self._scrub_x(X, missing, accept_sparse=True)
+        y = self._transform_and_dot(X, missing)
         if y.shape[1] == 1:
             return y[:, 0]
         else:
@@ -1256,19 +1343,21 @@ class Earth(BaseEstimator, RegressorMixin, TransformerMixin):
         if not skip_scrub:
             X, y, sample_weight, output_weight, missing = self._scrub(
                 X, y, sample_weight, output_weight, missing)
-        if sample_weight.shape[1] == 1 and y.shape[1] > 1:
-            sample_weight = np.repeat(sample_weight, y.shape[1], axis=1)
-        y_hat = self.predict(X)
+        # Broadcasting the weights creates a view instead of a copy
+        sample_weight = np.broadcast_to(sample_weight, y.shape)
+        y_hat = self.predict(X, missing, skip_scrub=True)
         if len(y_hat.shape) == 1:
             y_hat = y_hat[:, None]
 
-        residual = y - y_hat
-#         total_weight = np.sum(sample_weight)
-        mse = np.sum(sample_weight * (residual ** 2))
-        y_avg = np.average(y, weights=sample_weight, axis=0)
-
-        mse0 = np.sum(sample_weight * ((y - y_avg) ** 2))
-#         mse0 = np.sum(y_sqr * output_weight) / m
+        # The weighted sums are computed with einsum, which multiplies and
+        # accumulates in a single pass without elementwise temporaries.
+        # y_hat is not needed afterwards, so the residual overwrites it.
+        residual = np.subtract(y, y_hat, out=y_hat)
+        mse = np.einsum('ij,ij,ij->', sample_weight, residual, residual)
+        y_avg = (np.einsum('ij,ij->j', sample_weight, y) /
+                 np.sum(sample_weight, axis=0))
+        deviation = y - y_avg
+        mse0 = np.einsum('ij,ij,ij->', sample_weight, deviation, deviation)
         return 1 - (mse / mse0)
 
     def score_samples(self, X, y=None, missing=None):
@@ -1317,7 +1406,7 @@ class Earth(BaseEstimator, RegressorMixin, TransformerMixin):
         residual = 1 - (y - y_hat) ** 2 / y**2
         return residual
 
-    def transform(self, X, missing=None):
+    def transform(self, X, missing=None, out=None):
         '''
         Transform X into the basis space.  Normally, users will call the
         predict method instead, which both transforms into basis space
@@ -1333,7 +1422,7 @@ class Earth(BaseEstimator, RegressorMixin, TransformerMixin):
         X : array-like, shape = [m, n] where m is the number of samples and n
             is the number of features
             The training predictors.  The X parameter can be a numpy array, a
-            pandas DataFrame, or a patsy DesignMatrix.
+            scipy sparse matrix, a pandas DataFrame, or a patsy DesignMatrix.
 
         missing : array-like, shape = [m, n] where m is the number of samples
             and n is the number of features.
@@ -1344,6 +1433,12 @@ class Earth(BaseEstimator, RegressorMixin, TransformerMixin):
             argument is a pandas DataFrame, missing will be inferred from X if
             allow_missing is True.
 
+        out : array of shape [m, nb_terms], optional (default=None)
+            A float64 array into which the result is written.  Its previous
+            contents are overwritten.  Passing the same array in repeated
+            calls avoids allocating a new basis matrix each time.  A Fortran
+            ordered (column major) array is fastest to fill.
+
         Returns
         -------
 
@@ -1351,15 +1446,62 @@ class Earth(BaseEstimator, RegressorMixin, TransformerMixin):
            nb_terms is the number of terms (or basis functions) obtained after
            fitting (which is the number of elements of the attribute `basis_`).
            B represents the values of the basis functions evaluated at each
-           sample.
+           sample.  If out is given, B is out.
         '''
 
         check_is_fitted(self, "basis_")
-        X, missing = self._scrub_x(X, missing)
-        B = np.empty(shape=(X.shape[0], self.basis_.plen()), order='F')
-        self.basis_.transform(X, missing, B)
+        X, missing = self._scrub_x(X, missing, accept_sparse=True)
+        m = X.shape[0]
+        if out is None:
+            B = np.empty(shape=(m, self.basis_.plen()), order='F')
+        else:
+            if not isinstance(out, np.ndarray) or out.dtype != np.float64:
+                raise TypeError('out must be a numpy array of dtype float64.')
+            if out.shape != (m, self.basis_.plen()):
+                raise ValueError('out has shape %s but shape %s is required.'
+                                 % (out.shape, (m, self.basis_.plen())))
+            B = out
+        for start in range(0, m, PREDICT_BLOCK_SIZE):
+            stop = min(start + PREDICT_BLOCK_SIZE, m)
+            X_block, missing_block = self._get_block(X, missing, start, stop)
+            self.basis_.transform(X_block, missing_block, B[start:stop])
         return B
 
+    def _get_block(self, X, missing, start, stop):
+        '''
+        Return rows start:stop of X and missing.  Sparse X is converted to
+        dense and scrubbed here, one block at a time, so only a single block
+        is ever held in dense form.  Dense X and missing must already be
+        scrubbed.
+        '''
+        if sparse.issparse(X):
+            return self._scrub_x(
+                X[start:stop].toarray(order='F'),
+                None if missing is None else missing[start:stop])
+        return X[start:stop], missing[start:stop]
+
+    def _transform_and_dot(self, X, missing):
+        '''
+        Compute np.dot(self.transform(X, missing), self.coef_.T) without
+        materializing the full basis matrix.  Rows are transformed in
+        blocks of PREDICT_BLOCK_SIZE into a single reusable buffer.
+        X and missing must already be scrubbed (see _get_block).
+        '''
+        m = X.shape[0]
+        y = np.empty(shape=(m, self.coef_.shape[0]))
+        B = np.empty(shape=(min(m, PREDICT_BLOCK_SIZE), self.basis_.plen()),
+                     order='F')
+        for start in range(0, m, PREDICT_BLOCK_SIZE):
+            stop = min(start + PREDICT_BLOCK_SIZE, m)
+            X_block, missing_block = self._get_block(X, missing, start, stop)
+            B_block = B[:stop - start]
+            self.basis_.transform(X_block, missing_block, B_block)
+            # np.dot dispatches to BLAS and writes into y without allocating
+            # a temporary.  Calling scipy.linalg.blas.dgemv directly for a
+            # single output was measured to be no faster.
+            np.dot(B_block, self.coef_.T, out=y[start:stop])
+        return y
+
     def get_penalty(self):
         '''Get the penalty parameter being used.  Default is 3.'''
         if 'penalty' in self.__dict__ and self.penalty is not None:
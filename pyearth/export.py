@@ -1,15 +1,14 @@
+import numpy as np
+
+
 def export_python_function(earth_model):
     """
     Exports model as a pure python function, with no numpy/scipy/sklearn dependencies.
     :param earth_model: Trained pyearth model
     :return: A function that accepts an iterator over examples, and returns an iterator over transformed examples
     """
-    i = 0
-    accessors = []
-    for bf in earth_model.basis_:
-        if not bf.is_pruned():
-            accessors.append(bf.func_factory(earth_model.coef_[0, i]))
-            i += 1
+    accessors = [bf.func_factory(coef) for bf, coef in
+                 zip(earth_model.basis_.piter(), earth_model.coef_[0])]
 
     def func(example_iterator):
         return [sum(accessor(row) for accessor in accessors) for row in example_iterator]
@@ -24,12 +23,8 @@ def export_python_string(earth_model, function_name="model"):
     :return: string, when executed (either by writing to a file, or using `exec`, will define a python
       function that accepts an iterator over examples, and returns an iterator over transformed examples
     """
-    i = 0
-    accessors = []
-    for bf in earth_model.basis_:
-        if not bf.is_pruned():
-            accessors.append(bf.func_string_factory(earth_model.coef_[0, i]))
-            i += 1
+    accessors = [bf.func_string_factory(coef) for bf, coef in
+                 zip(earth_model.basis_.piter(), earth_model.coef_[0])]
 
     return """def {:s}(example_iterator):
     accessors = [{:s}]
@@ -37,6 +32,92 @@ def export_python_string(earth_model, function_name="model"):
         yield sum(accessor(x) for accessor in accessors)
     """.format(function_name, ",\n\t\t".join(accessors))
 
+def export_numpy_function(earth_model):
+    """
+    Exports model as a vectorized function operating on numpy arrays.  The model is
+    converted to python source with all knots and coefficients inlined, which is
+    compiled once, so repeated calls avoid the per call overhead of Earth.predict.
+    :param earth_model: Trained pyearth model
+    :return: A function that accepts an array of shape [m, n], with missing values (if any)
+      represented by nan, and returns the predictions as an array of shape [m], or [m, p]
+      for models with p > 1 outputs
+    """
+    from ._basis import LinearBasisFunction, HingeBasisFunction, SmoothedHingeBasisFunction, \
+          MissingnessBasisFunction, ConstantBasisFunction
+
+    def linear_bf_to_factor(bf, x):
+        return x
+
+    def hinge_bf_to_factor(bf, x):
+        if bf.get_reverse():
+            return 'maximum(0.0, {!r} - {:s})'.format(float(bf.get_knot()), x)
+        else:
+            return 'maximum(0.0, {:s} - {!r})'.format(x, float(bf.get_knot()))
+
+    def smoothed_hinge_bf_to_factor(bf, x):
+        args = {'x': x,
+                'p': float(bf.get_p()),
+                'r': float(bf.get_r()),
+                't': float(bf.get_knot()),
+                't_minus': float(bf.get_knot_minus()),
+                't_plus': float(bf.get_knot_plus())}
+        if bf.get_reverse():
+            return ('where({x} <= {t_minus!r}, {t!r} - {x}, where({x} < {t_plus!r}, '
+                    '{p!r} * ({x} - {t_plus!r}) ** 2 + {r!r} * ({x} - {t_plus!r}) ** 3, '
+                    '0.0))').format(**args)
+        else:
+            return ('where({x} <= {t_minus!r}, 0.0, where({x} < {t_plus!r}, '
+                    '{p!r} * ({x} - {t_minus!r}) ** 2 + {r!r} * ({x} - {t_minus!r}) ** 3, '
+                    '{x} - {t!r}))').format(**args)
+
+    def missingness_bf_to_factor(bf, x):
+        if bf.complement:
+            return '(~isnan({:s}))'.format(x)
+        else:
+            return 'isnan({:s})'.format(x)
+
+    bf_to_factor_dispatcher = {LinearBasisFunction: linear_bf_to_factor,
+                               SmoothedHingeBasisFunction: smoothed_hinge_bf_to_factor,
+                               HingeBasisFunction: hinge_bf_to_factor,
+                               MissingnessBasisFunction: missingness_bf_to_factor}
+
+    # As in Earth.transform, a data factor evaluated at a missing value is treated
+    # as 1.  Any variable may be missing if the model allows missing data, whether
+    # or not the basis has a missingness term for it.
+    allow_missing = earth_model.allow_missing
+
+    def bf_to_term(bf):
+        factors = []
+        while not isinstance(bf, ConstantBasisFunction):
+            x = 'X[:, {:d}]'.format(bf.get_variable())
+            factor = bf_to_factor_dispatcher[bf.__class__](bf, x)
+            if allow_missing and not isinstance(bf, MissingnessBasisFunction):
+                factor = 'where(isnan({:s}), 1.0, {:s})'.format(x, factor)
+            factors.append(factor)
+            bf = bf.get_parent()
+        return ' * '.join(factors) if factors else 'ones(X.shape[0])'
+
+    terms = [bf_to_term(bf) for bf in earth_model.basis_.piter()]
+    lines = ['def model(X):',
+             '    X = asarray(X, dtype=float64)',
+             '    if X.ndim == 1:',
+             '        X = X[:, None]']
+    for j, term in enumerate(terms):
+        lines.append('    t{:d} = {:s}'.format(j, term))
+    outputs = [' + '.join('{!r} * t{:d}'.format(float(c), j) for j, c in enumerate(coef))
+               for coef in earth_model.coef_]
+    if len(outputs) == 1:
+        lines.append('    return {:s}'.format(outputs[0]))
+    else:
+        lines.append('    return column_stack([{:s}])'.format(', '.join(outputs)))
+
+    namespace = {'asarray': np.asarray, 'float64': np.float64, 'ones': np.ones,
+                 'maximum': np.maximum, 'where': np.where, 'isnan': np.isnan,
+                 'column_stack': np.column_stack}
+    exec(compile('\n'.join(lines) + '\n', '<pyearth>', 'exec'), namespace)
+    return namespace['model']
+
+
 def export_sympy_term_expressions(earth_model):
     """
     Construct a list of sympy expressions for all non-pruned terms in the model.
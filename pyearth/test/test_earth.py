@@ -106,6 +106,57 @@ def test_linear_fit():
     assert_almost_equal(numpy.mean((earth.coef_ - soln) ** 2), 0.0)
 
 
+def test_linear_fit_rank_deficient():
+    # Two identical basis functions make the normal equations singular
+    basis_ = Basis(10)
+    basis_.append(constant)
+    basis_.append(HingeBasisFunction(constant, 0.1, 10, 1, False, 'x1'))
+    basis_.append(HingeBasisFunction(constant, 0.1, 10, 1, False, 'x1'))
+    basis_.append(LinearBasisFunction(constant, 2, 'x2'))
+    y_ = (2 * numpy.maximum(0, X[:, 1] - 0.1) + X[:, 2] +
+          0.01 * numpy.random.normal(size=X.shape[0]))
+    earth = Earth(**default_params)
+    earth.basis_ = basis_
+    earth.linear_fit(X, y_)
+    assert_true(numpy.all(numpy.isfinite(earth.coef_)))
+    assert_almost_equal(earth.coef_[0, 1] + earth.coef_[0, 2], 2.0, places=2)
+    assert_true(earth.rsq_ > 0.99)
+
+
+
+def test_linear_fit_collinear_forward_basis():
+    # Forward pass bases are routinely numerically singular without making
+    # cho_factor fail.  The fit must still match least squares on the basis.
+    random_state = numpy.random.RandomState(2)
+    X_ = random_state.uniform(-1, 1, size=(500, 6))
+    y_ = (X_[:, 0] * X_[:, 1] * numpy.abs(X_[:, 2]) + numpy.sin(2 * X_[:, 3]) +
+          random_state.normal(0, .3, size=500))
+    earth = Earth(max_degree=3, enable_pruning=False).fit(X_, y_)
+    B = earth.transform(X_)
+    assert_true(numpy.linalg.matrix_rank(B) < B.shape[1])
+    coef = numpy.linalg.lstsq(B, y_, rcond=None)[0]
+    mse = numpy.mean((numpy.dot(B, coef) - y_) ** 2)
+    assert_true(numpy.max(numpy.abs(earth.coef_)) < 1e6)
+    assert_almost_equal(earth.mse_, mse, places=10)
+
+def test_linear_fit_large_offset():
+    # A large offset makes the basis badly scaled but not rank deficient
+    X_ = X.copy()
+    X_[:, 2] += 1e7
+    y_ = (2 * numpy.maximum(0, X[:, 1] - 0.1) + X[:, 2] +
+          0.01 * numpy.random.normal(size=X.shape[0]))
+    basis_ = Basis(10)
+    basis_.append(constant)
+    basis_.append(HingeBasisFunction(constant, 0.1, 10, 1, False, 'x1'))
+    basis_.append(LinearBasisFunction(constant, 2, 'x2'))
+    earth = Earth(**default_params)
+    earth.basis_ = basis_
+    earth.linear_fit(X_, y_)
+    assert_almost_equal(earth.coef_[0, 1], 2.0, places=2)
+    assert_almost_equal(earth.coef_[0, 2], 1.0, places=2)
+    assert_true(earth.rsq_ > 0.99)
+
+
 def test_sample_weight():
     group = numpy.random.binomial(1, .5, size=1000) == 1
     sample_weight = 1 / (group * 100 + 1.0)
@@ -152,6 +203,47 @@ def test_output_weight():
                 round(abs(group1_mean - group2_mean), 7) == 0)
 
 
+def test_weights_not_modified():
+    x = numpy.random.uniform(-1, 1, size=(100, 1))
+    y = numpy.abs(x)
+    sample_weight = numpy.random.uniform(1, 2, size=100)
+    sample_weight_copy = sample_weight.copy()
+    Earth().fit(x, y, sample_weight=sample_weight,
+                output_weight=numpy.array([2.]))
+    assert_array_almost_equal(sample_weight, sample_weight_copy)
+
+
+def test_scrub_does_not_copy():
+    x = numpy.asfortranarray(numpy.random.uniform(-1, 1, size=(100, 2)))
+    y = numpy.abs(x[:, 0])
+    sample_weight = numpy.random.uniform(1, 2, size=100)
+    x_, y_, sample_weight_, output_weight_, missing_ = Earth()._scrub(
+        x, y, sample_weight, None, None)
+    assert_true(numpy.may_share_memory(x_, x))
+    assert_true(numpy.may_share_memory(y_, y))
+    assert_true(numpy.may_share_memory(sample_weight_, sample_weight))
+    Y = numpy.column_stack([y, y])
+    x_, y_, sample_weight_, output_weight_, missing_ = Earth()._scrub(
+        x, Y, sample_weight, numpy.array([1., 2.]), None)
+    assert_equal(sample_weight_.shape, (100, 2))
+    assert_array_almost_equal(sample_weight_[:, 1], 2 * sample_weight)
+
+
+def test_transform_out():
+    model = Earth(**default_params).fit(X, y)
+    B = model.transform(X)
+    out = numpy.empty(B.shape, order='F')
+    assert_true(model.transform(X, out=out) is out)
+    assert_array_almost_equal(out, B)
+    out_c = numpy.zeros(B.shape)
+    model.transform(X, out=out_c)
+    assert_array_almost_equal(out_c, B)
+    assert_raises(ValueError, model.transform, X,
+                  out=numpy.empty((B.shape[0], B.shape[1] + 1)))
+    assert_raises(TypeError, model.transform, X,
+                  out=numpy.empty(B.shape, dtype=numpy.float32))
+
+
 def test_missing_data():
     numpy.random.seed(0)
     earth = Earth(allow_missing=True, **default_params)
@@ -246,6 +338,21 @@ def test_score():
     assert_almost_equal(rsq, model.score(X, y))
 
 
+def test_predict_blocked():
+    model = Earth(**default_params).fit(X, y)
+    X_big = numpy.random.normal(
+        size=(pyearth.earth.PREDICT_BLOCK_SIZE * 2 + 17, X.shape[1]))
+    assert_array_almost_equal(model.predict(X_big),
+                              numpy.dot(model.transform(X_big),
+                                        model.coef_[0]))
+
+
+def test_predict_skip_scrub():
+    model = Earth(**default_params).fit(X, y)
+    assert_array_almost_equal(model.predict(X, skip_scrub=True),
+                              model.predict(X))
+
+
 @if_pandas
 @if_environ_has('test_pathological_cases')
 def test_pathological_cases():
@@ -316,6 +423,7 @@ def test_pickle_compatibility():
     model_copy = pickle.loads(pickle.dumps(model))
     assert_true(model_copy == model)
     assert_array_almost_equal(model.predict(X), model_copy.predict(X))
+    assert_equal(model.summary(), model_copy.summary())
     assert_true(model.basis_[0] is model.basis_[1]._get_root())
     assert_true(model_copy.basis_[0] is model_copy.basis_[1]._get_root())
 
@@ -395,6 +503,12 @@ def test_eq():
     model3.unknown_parameter = 5
     assert_not_equal(model1, model3)
 
+    model4 = Earth(**default_params).fit(X, y)
+    model5 = copy.copy(model4)
+    assert_equal(model4, model5)
+    model5.coef_ = model4.coef_[:, :-1]
+    assert_not_equal(model4, model5)
+
 
 def test_sparse():
     X_sparse = csr_matrix(X)
@@ -404,11 +518,20 @@ def test_sparse():
 
     model = Earth(**default_params)
     model.fit(X, y)
-    assert_raises(TypeError, model.predict, X_sparse)
     assert_raises(TypeError, model.predict_deriv, X_sparse)
-    assert_raises(TypeError, model.transform, X_sparse)
     assert_raises(TypeError, model.score, X_sparse)
 
+    # predict and transform accept sparse input
+    X_big = numpy.random.normal(
+        size=(pyearth.earth.PREDICT_BLOCK_SIZE + 17, X.shape[1]))
+    X_big[numpy.random.binomial(1, .8, X_big.shape).astype(bool)] = 0.
+    for X_ in (X_sparse, csr_matrix(X_big)):
+        assert_array_almost_equal(model.predict(X_),
+                                  model.predict(X_.toarray()))
+        assert_array_almost_equal(model.transform(X_.tocsc()),
+                                  model.transform(X_.toarray()))
+    assert_raises(ValueError, model.predict, X_sparse[:, 0:5])
+
     model = Earth(**default_params)
     sample_weight = csr_matrix([1.] * X.shape[0])
     assert_raises(TypeError, model.fit, X, y, sample_weight)
@@ -474,6 +597,18 @@ def test_xlabels():
     model.fit(X[:, 0:3], y, xlabels=['var1', 'var2', 'var3'])
 
 
+def test_scrape_labels():
+    model = Earth()
+    assert_list_equal(model._scrape_labels(X[:, 0:3]), ['x0', 'x1', 'x2'])
+    assert_list_equal(model._scrape_labels(X[:, 0]), ['x0'])
+    assert_list_equal(model._scrape_labels([[1., 2.], [3., 4.]]),
+                      ['x0', 'x1'])
+    assert_list_equal(model._scrape_labels(csr_matrix(X[:, 0:2])),
+                      ['x0', 'x1'])
+    structured = numpy.zeros(3, dtype=[('a', float), ('b', float)])
+    assert_list_equal(model._scrape_labels(structured), ['a', 'b'])
+
+
 def test_untrained():
     # NotFittedError moved from utils.validation to exceptions
     # some time after 0.17.1
@@ -1,7 +1,7 @@
 from pyearth._basis import (Basis, ConstantBasisFunction, HingeBasisFunction,
                             LinearBasisFunction)
 from pyearth.export import export_python_function, export_python_string,\
-    export_sympy
+    export_numpy_function, export_sympy
 from nose.tools import assert_almost_equal
 import numpy
 import six
@@ -53,6 +53,21 @@ def test_export_python_string():
         for exp_pred, model_pred in zip(model.predict(X), my_test_model(X)):
             assert_almost_equal(exp_pred, model_pred)
 
+def test_export_numpy_function():
+    for smooth, n_cols, allow_missing in product((True, False), (1, 2), (True, False)):
+        X_ = X.copy()
+        if allow_missing:
+            X_[numpy.random.binomial(n=1, p=.1, size=X_.shape[0]).astype(bool), 1] = numpy.nan
+        model = Earth(allow_missing=allow_missing, smooth=smooth,
+                      max_degree=2).fit(X_, Y[:, :n_cols])
+        export_model = export_numpy_function(model)
+        assert_array_almost_equal(model.predict(X_), export_model(X_))
+        if allow_missing:
+            # Also put missing values in variables that have no missingness
+            # term in the basis
+            X_[numpy.random.binomial(n=1, p=.1, size=X_.shape).astype(bool)] = numpy.nan
+            assert_array_almost_equal(model.predict(X_), export_model(X_))
+
 @if_pandas
 @if_sympy
 def test_export_sympy():
@@ -1,3 +1,7 @@
+import numpy
+from nose.tools import assert_true, assert_less
+
+from pyearth import Earth
 
 
 class Test(object):
@@ -8,6 +12,75 @@ class Test(object):
     def test(self):
         pass
 
+
+def test_pruning_trace_with_collinear_basis():
+    # With max_degree=2 the forward pass adds pairs of hinges times a shared
+    # parent, which makes the basis exactly collinear.  Check each step of
+    # the pruning trace against least squares fits on the basis itself.
+    numpy.random.seed(0)
+    m = 500
+    X = numpy.random.uniform(-1, 1, size=(m, 5))
+    y = (numpy.abs(X[:, 0]) * X[:, 1] + numpy.sin(3 * X[:, 2]) +
+         numpy.random.normal(0, .2, m))
+    for sample_weight in (numpy.ones(m), numpy.random.uniform(.5, 2, m)):
+        model = Earth(max_degree=2, max_terms=30)
+        model.forward_pass(X, y, sample_weight=sample_weight)
+        model.pruning_pass(X, y, sample_weight=sample_weight)
+        record = model.pruning_pass_record_
+        for bf in model.basis_:
+            bf.unprune()
+        B = model.transform(X) * numpy.sqrt(sample_weight)[:, numpy.newaxis]
+        assert_true(numpy.linalg.cond(B) > 1e12)
+        weighted_y = y * numpy.sqrt(sample_weight)
+        total_weight = numpy.sum(sample_weight)
+
+        def rss(cols):
+            beta = numpy.linalg.lstsq(B[:, cols], weighted_y, rcond=None)[0]
+            return numpy.sum((numpy.dot(B[:, cols], beta) - weighted_y) ** 2)
+
+        active = list(range(len(model.basis_)))
+        previous = record.mse(0)
+        assert_less(abs(previous * total_weight - rss(active)),
+                    1e-8 * rss(active))
+        for i in range(1, len(record)):
+            pruned = record[i].get_pruned()
+            candidates = dict((j, rss([k for k in active if k != j]))
+                              for j in active
+                              if model.basis_[j].is_prunable())
+            best = min(candidates.values())
+            assert_less(candidates[pruned] - best, 1e-8 * best)
+            assert_less(abs(record.mse(i) * total_weight - candidates[pruned]),
+                        1e-8 * candidates[pruned])
+            assert_true(record.mse(i) >= previous * (1 - 1e-12))
+            previous = record.mse(i)
+            active.remove(pruned)
+
+
+def test_pruning_with_large_offset():
+    # A large offset makes the basis badly scaled but not rank deficient,
+    # so no terms should be lost to the rank decision.
+    numpy.random.seed(0)
+    m = 400
+    Z = numpy.random.uniform(-1, 1, size=(m, 3))
+    y = 3 * Z[:, 0] + numpy.abs(Z[:, 1]) + numpy.random.normal(0, .05, m)
+    for offset in (1e5, 1e7):
+        X = Z.copy()
+        X[:, 0] += offset
+        model = Earth(max_degree=1)
+        model.forward_pass(X, y)
+        model.pruning_pass(X, y)
+        record = model.pruning_pass_record_
+        for bf in model.basis_:
+            bf.unprune()
+        B = model.transform(X)
+        B /= numpy.sqrt(numpy.sum(B ** 2, axis=0))
+        beta = numpy.linalg.lstsq(B, y, rcond=None)[0]
+        full_rss = numpy.sum((numpy.dot(B, beta) - y) ** 2)
+        assert_less(abs(record.mse(0) * m - full_rss), 1e-6 * full_rss)
+        model.fit(X, y)
+        assert_less(.999, model.score(X, y))
+
+
 if __name__ == '__main__':
     import nose
     nose.run(argv=[__file__, '-s', '-v'])